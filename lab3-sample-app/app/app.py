@@ -5,41 +5,184 @@ This Flask application demonstrates secure access to Azure Storage
 using workload identity (managed identity) from AKS.
 """
 
-from flask import Flask, jsonify, render_template_string
+from flask import Flask, Response, request, url_for
+from azure.core.pipeline.transport import RequestsTransport
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient, BlobClient
-from datetime import datetime
+from azure.storage.blob import BlobServiceClient, BlobType, ContentSettings, LinearRetry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import atexit
+import gzip
+import operator
+import orjson
 import os
 import logging
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+# Defaults to WARNING so per-request INFO messages are skipped in production;
+# set LOG_LEVEL=INFO (or DEBUG) for more detail
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'WARNING').upper())
 logger = logging.getLogger(__name__)
+# The SDK logs every request and response at INFO; failed calls are already
+# logged by the handlers, so keep the SDK's HTTP logging to warnings
+logging.getLogger('azure.core.pipeline.policies.http_logging_policy').setLevel(logging.WARNING)
 
 app = Flask(__name__)
 
 # Get configuration from environment variables
 STORAGE_ACCOUNT_NAME = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
 CONTAINER_NAME = os.getenv('AZURE_STORAGE_CONTAINER_NAME', 'data')
+# Size of the keep-alive connection pool to the storage account.
+# Should be at least the number of threads per worker.
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '64'))
+# How long a health check result is reused before checking storage again.
+# Failures are cached briefly so queued probes do not each retry a failing call
+HEALTH_CACHE_SECONDS = float(os.getenv('HEALTH_CACHE_SECONDS', '5'))
+HEALTH_FAILURE_CACHE_SECONDS = 1.0
+# Default and maximum number of blobs returned per /list page
+# (Azure Storage returns at most 5000 results per listing call)
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+# Number of blobs included in the /summary response
+SUMMARY_PAGE_SIZE = 50
+# JSON responses at least this large are gzip-compressed when the client accepts it
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 5
+# Background upload threads and retry attempts per upload
+UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', '8'))
+# Each attempt also goes through the SDK's own retry policy, so keep this low
+UPLOAD_ATTEMPTS = 2
+# Name prefix for test files written by this app. Other labs write their own
+# test-file-* blobs to the same container, so only this prefix is ours
+TEST_FILE_PREFIX = 'test-file-py-'
+# Number of recent uploads whose status can be queried via /upload/status
+MAX_TRACKED_UPLOADS = 1000
+# Parallel block uploads per blob; only used once a payload exceeds the
+# single-PUT size and is split into blocks
+UPLOAD_MAX_CONCURRENCY = int(os.getenv('UPLOAD_MAX_CONCURRENCY', '8'))
+# Test files (TEST_FILE_PREFIX) older than this are deleted by the background cleanup
+TEST_FILE_RETENTION_MINUTES = int(os.getenv('TEST_FILE_RETENTION_MINUTES', '60'))
+# Seconds between cleanup runs; set to 0 to disable cleanup
+CLEANUP_INTERVAL_SECONDS = int(os.getenv('CLEANUP_INTERVAL_SECONDS', '300'))
+# Maximum number of deletes in a single blob batch request
+DELETE_BATCH_SIZE = 256
 
 # Validate configuration
 if not STORAGE_ACCOUNT_NAME:
     logger.error("AZURE_STORAGE_ACCOUNT_NAME environment variable is not set")
     raise ValueError("AZURE_STORAGE_ACCOUNT_NAME must be set")
 
+# OAuth scope for Azure Storage data plane access
+STORAGE_SCOPE = 'https://storage.azure.com/.default'
+# /readyz reports not ready once the storage token is this close to expiry
+READY_TOKEN_MIN_SECONDS = 60
+# Refresh cached tokens when they are within this many seconds of expiry
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+
+class CachingCredential:
+    """Wraps a credential and reuses its access tokens until near expiry.
+
+    Some credentials in the DefaultAzureCredential chain do not cache tokens
+    in-process, so every get_token call would otherwise hit IMDS or the CLI.
+    """
+
+    def __init__(self, credential):
+        self._credential = credential
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        key = (scopes, kwargs.get('claims'), kwargs.get('tenant_id'))
+        token = self._tokens.get(key)
+        if token and token.expires_on - time.time() > TOKEN_REFRESH_MARGIN_SECONDS:
+            return token
+        with self._lock:
+            # Another thread may have refreshed the token while we waited
+            token = self._tokens.get(key)
+            if token and token.expires_on - time.time() > TOKEN_REFRESH_MARGIN_SECONDS:
+                return token
+            token = self._credential.get_token(*scopes, **kwargs)
+            self._tokens[key] = token
+            return token
+
+    def close(self):
+        self._credential.close()
+
+
 # Initialize Azure Storage client with DefaultAzureCredential
 # This automatically uses workload identity when running in AKS
 account_url = f"https://{STORAGE_ACCOUNT_NAME}.blob.core.windows.net"
-logger.info(f"Initializing BlobServiceClient for {account_url}")
+logger.info("Initializing BlobServiceClient for %s", account_url)
 
 try:
-    credential = DefaultAzureCredential()
-    blob_service_client = BlobServiceClient(account_url, credential=credential)
+    credential = CachingCredential(DefaultAzureCredential())
+
+    # Share one keep-alive connection pool across all request threads so
+    # TLS sessions to the storage account are reused instead of rebuilt
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=0  # Retries are handled by the Azure SDK pipeline
+    )
+    session.mount('https://', adapter)
+    # Fail fast under throttling or outages instead of tying up request
+    # threads. Timeouts must be set on the transport itself: the SDK ignores
+    # connection_timeout/read_timeout when a custom transport is passed in
+    transport = RequestsTransport(
+        session=session,
+        session_owner=False,
+        connection_timeout=3,
+        read_timeout=10
+    )
+
+    # Two quick jittered retries, 0.25-0.75s apart
+    retry_policy = LinearRetry(backoff=0.5, random_jitter_range=0.25, retry_total=2)
+
+    blob_service_client = BlobServiceClient(
+        account_url,
+        credential=credential,
+        transport=transport,
+        retry_policy=retry_policy,
+        max_single_put_size=64 * 1024 * 1024,
+        max_block_size=8 * 1024 * 1024
+    )
+    # Reuse a single container client across all requests
+    container_client = blob_service_client.get_container_client(CONTAINER_NAME)
     logger.info("BlobServiceClient initialized successfully")
 except Exception as e:
-    logger.error(f"Failed to initialize BlobServiceClient: {str(e)}")
+    logger.error("Failed to initialize BlobServiceClient: %s", e)
     raise
 
+
+# Warm up at startup so the first request does not pay for credential
+# discovery, token acquisition and the TLS handshake to the storage account
+try:
+    credential.get_token(STORAGE_SCOPE)
+    logger.info("Storage access token pre-fetched")
+    container_client.get_container_properties()
+    logger.info("Storage connection warmed up")
+except Exception as e:
+    logger.warning("Startup warm-up failed, continuing: %s", e)
+
+
+@atexit.register
+def close_clients():
+    """Release pooled connections held by the shared clients on shutdown"""
+    # Let queued uploads finish before their client is closed
+    upload_pool.shutdown(wait=True)
+    blob_service_client.close()
+    session.close()
+    credential.close()
+
+
 # HTML template for the home page
 HOME_TEMPLATE = """
 <!DOCTYPE html>
@@ -117,20 +260,31 @@ HOME_TEMPLATE = """
         <h2>Available Endpoints:</h2>
         
         <div class="endpoint">
-            <strong>GET /health</strong> - Health check endpoint
+            <strong>GET /health</strong> - Health check endpoint (checks the storage container)
+        </div>
+        
+        <div class="endpoint">
+            <strong>GET /livez</strong>, <strong>GET /readyz</strong> - Lightweight liveness and readiness probes
+        </div>
+        
+        <div class="endpoint">
+            <strong>GET /list?page_size=N&amp;marker=...</strong> - List blobs in the container, one page at a time
         </div>
         
         <div class="endpoint">
-            <strong>GET /list</strong> - List all blobs in the container
+            <strong>GET /summary</strong> - Health status and the first page of blobs in one call
         </div>
         
         <div class="endpoint">
             <strong>POST /upload</strong> - Upload a test file to the container
         </div>
+        
+        <div class="endpoint">
+            <strong>GET /upload/status?name=...</strong> - Check the result of a queued upload
+        </div>
 
         <h2>Quick Actions:</h2>
-        <button onclick="checkHealth()">Check Health</button>
-        <button onclick="listBlobs()">List Blobs</button>
+        <button onclick="checkStorage()">Check Health &amp; List Blobs</button>
         <button onclick="uploadTest()">Upload Test File</button>
 
         <div id="result" class="result" style="display:none;"></div>
@@ -143,15 +297,8 @@ HOME_TEMPLATE = """
             resultDiv.style.display = 'block';
         }
 
-        function checkHealth() {
-            fetch('/health')
-                .then(response => response.json())
-                .then(data => showResult(data))
-                .catch(error => showResult({error: error.message}));
-        }
-
-        function listBlobs() {
-            fetch('/list')
+        function checkStorage() {
+            fetch('/summary')
                 .then(response => response.json())
                 .then(data => showResult(data))
                 .catch(error => showResult({error: error.message}));
@@ -168,109 +315,371 @@ HOME_TEMPLATE = """
 </html>
 """
 
+# The home page only depends on configuration fixed at startup, so render it
+# once using Flask's Jinja environment (keeps autoescaping) and reuse the bytes
+HOME_PAGE = app.jinja_env.from_string(HOME_TEMPLATE).render(
+    storage_account=STORAGE_ACCOUNT_NAME,
+    container_name=CONTAINER_NAME
+).encode('utf-8')
+
 @app.route('/')
 def home():
     """Home page with information about the application"""
-    return render_template_string(
-        HOME_TEMPLATE,
-        storage_account=STORAGE_ACCOUNT_NAME,
-        container_name=CONTAINER_NAME
+    # Build a fresh Response per request so after-request hooks never
+    # mutate a shared object; the body bytes themselves are reused
+    return Response(
+        HOME_PAGE,
+        mimetype='text/html',
+        headers={'Cache-Control': 'public, max-age=3600'}
     )
 
+def json_response(payload, status=200):
+    """Serialize payload with orjson, which encodes datetimes natively
+
+    Large bodies such as blob listings are gzip-compressed when the client
+    sends Accept-Encoding: gzip.
+    """
+    body = orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+    response = Response(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    # Check the quality rather than membership so gzip;q=0 is honoured
+    if len(body) >= COMPRESS_MIN_SIZE and request.accept_encodings['gzip'] > 0:
+        response.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@app.route('/livez')
+def livez():
+    """Liveness probe: the process is up and serving requests"""
+    return Response(b'ok', mimetype='text/plain')
+
+@app.route('/readyz')
+def readyz():
+    """Readiness probe: a valid storage token is available
+
+    Tokens are served from the in-memory cache, so this normally makes no
+    network calls. Use /health for a deep check against the container.
+    """
+    try:
+        token = credential.get_token(STORAGE_SCOPE)
+        if token.expires_on - time.time() > READY_TOKEN_MIN_SECONDS:
+            return Response(b'ok', mimetype='text/plain')
+        logger.warning("Storage token is about to expire")
+    except Exception as e:
+        logger.error("Readiness check failed: %s", e)
+    return Response(b'not ready', status=503, mimetype='text/plain')
+
+# Last health check result as (payload, status code), shared by all request
+# threads; expires_at starts in the past so the first probe always checks
+health_cache = {'expires_at': float('-inf'), 'result': None}
+health_lock = threading.Lock()
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    try:
-        # Try to get container properties to verify connectivity
-        container_client = blob_service_client.get_container_client(CONTAINER_NAME)
-        container_client.get_container_properties()
-        
-        return jsonify({
-            'status': 'healthy',
-            'storage_account': STORAGE_ACCOUNT_NAME,
-            'container': CONTAINER_NAME,
-            'authentication': 'workload_identity',
-            'timestamp': datetime.utcnow().isoformat()
+    # Serve a recent result so bursts of probes share one check
+    if time.monotonic() < health_cache['expires_at']:
+        return json_response(*health_cache['result'])
+
+    with health_lock:
+        # Threads that queued behind a check reuse the result it produced
+        if time.monotonic() < health_cache['expires_at']:
+            return json_response(*health_cache['result'])
+
+        try:
+            # Try to get container properties to verify connectivity
+            container_client.get_container_properties()
+
+            result = ({
+                'status': 'healthy',
+                'storage_account': STORAGE_ACCOUNT_NAME,
+                'container': CONTAINER_NAME,
+                'authentication': 'workload_identity',
+                'timestamp': datetime.now(timezone.utc)
+            }, 200)
+            ttl = HEALTH_CACHE_SECONDS
+        except Exception as e:
+            logger.error("Health check failed: %s", e)
+            # Return a sanitized error message for security
+            result = ({
+                'status': 'unhealthy',
+                'error': 'Unable to connect to storage account. Check logs for details.',
+                'timestamp': datetime.now(timezone.utc)
+            }, 500)
+            ttl = HEALTH_FAILURE_CACHE_SECONDS
+
+        # Store the result before extending the expiry so a reader that sees
+        # a fresh expiry also sees the matching result
+        health_cache['result'] = result
+        health_cache['expires_at'] = time.monotonic() + ttl
+        return json_response(*result)
+
+# Pulls the fields returned by /list from a BlobProperties in one call
+blob_fields = operator.attrgetter(
+    'name', 'size', 'last_modified', 'content_settings.content_type'
+)
+
+def fetch_blob_page(page_size, marker=None):
+    """Fetch a single page of blobs and return it with its continuation token"""
+    # Fetch a single page so memory and latency are bounded by page_size
+    pages = container_client.list_blobs(results_per_page=page_size).by_page(
+        continuation_token=marker
+    )
+    blobs = []
+    append = blobs.append
+
+    # Listing results always carry last_modified and content_settings
+    for name, size, last_modified, content_type in map(blob_fields, next(pages, [])):
+        append({
+            'name': name,
+            'size': size,
+            'last_modified': last_modified,
+            'content_type': content_type
         })
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        # Return a sanitized error message for security
-        return jsonify({
-            'status': 'unhealthy',
-            'error': 'Unable to connect to storage account. Check logs for details.',
-            'timestamp': datetime.utcnow().isoformat()
-        }), 500
+
+    return blobs, pages.continuation_token
 
 @app.route('/list')
 def list_blobs():
-    """List all blobs in the container"""
+    """List one page of blobs in the container
+
+    Query parameters:
+        page_size: number of blobs to return (default 500, max 5000)
+        marker: continuation token returned as next_marker by a previous call
+    """
+    page_size = request.args.get('page_size', DEFAULT_PAGE_SIZE, type=int)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    marker = request.args.get('marker') or None
+
     try:
-        container_client = blob_service_client.get_container_client(CONTAINER_NAME)
-        blobs = []
-        
-        for blob in container_client.list_blobs():
-            blobs.append({
-                'name': blob.name,
-                'size': blob.size,
-                'last_modified': blob.last_modified.isoformat() if blob.last_modified else None,
-                'content_type': blob.content_settings.content_type if blob.content_settings else None
-            })
+        blobs, next_marker = fetch_blob_page(page_size, marker)
         
-        logger.info(f"Listed {len(blobs)} blobs from container {CONTAINER_NAME}")
+        logger.info("Listed %d blobs from container %s", len(blobs), CONTAINER_NAME)
         
-        return jsonify({
+        return json_response({
             'container': CONTAINER_NAME,
             'blob_count': len(blobs),
             'blobs': blobs,
-            'timestamp': datetime.utcnow().isoformat()
+            'next_marker': next_marker,
+            'timestamp': datetime.now(timezone.utc)
         })
     except Exception as e:
-        logger.error(f"Failed to list blobs: {str(e)}")
+        logger.error("Failed to list blobs: %s", e)
         # Return a sanitized error message for security
-        return jsonify({
+        return json_response({
             'error': 'Unable to list blobs. Check logs for details.',
-            'timestamp': datetime.utcnow().isoformat()
-        }), 500
+            'timestamp': datetime.now(timezone.utc)
+        }, 500)
+
+@app.route('/summary')
+def summary():
+    """Health status and the first page of blobs in a single storage call
+
+    A successful listing proves the container is reachable, so this avoids
+    a separate GetContainerProperties round-trip.
+    """
+    try:
+        blobs, next_marker = fetch_blob_page(SUMMARY_PAGE_SIZE)
+
+        return json_response({
+            'status': 'healthy',
+            'storage_account': STORAGE_ACCOUNT_NAME,
+            'container': CONTAINER_NAME,
+            'authentication': 'workload_identity',
+            'blob_count': len(blobs),
+            'blobs': blobs,
+            'next_marker': next_marker,
+            'timestamp': datetime.now(timezone.utc)
+        })
+    except Exception as e:
+        logger.error("Summary failed: %s", e)
+        # Return a sanitized error message for security
+        return json_response({
+            'status': 'unhealthy',
+            'error': 'Unable to connect to storage account. Check logs for details.',
+            'timestamp': datetime.now(timezone.utc)
+        }, 500)
+
+# Uploads run on a bounded pool so request threads do not wait on the PUT
+upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='blob-upload')
+# Most recent upload futures by blob name, oldest first
+upload_futures = OrderedDict()
+upload_futures_lock = threading.Lock()
+
+# Content type for test files, set on the initial PUT
+TEST_FILE_CONTENT_SETTINGS = ContentSettings(content_type='text/plain; charset=utf-8')
+
+def upload_with_retry(blob_name, data):
+    """Upload a blob, retrying once after 1s if the SDK's own retries fail"""
+    blob_client = container_client.get_blob_client(blob_name)
+    for attempt in range(UPLOAD_ATTEMPTS):
+        try:
+            blob_client.upload_blob(
+                data,
+                blob_type=BlobType.BLOCKBLOB,
+                length=len(data),
+                content_settings=TEST_FILE_CONTENT_SETTINGS,
+                overwrite=True,
+                max_concurrency=UPLOAD_MAX_CONCURRENCY
+            )
+            logger.info("Successfully uploaded blob: %s", blob_name)
+            return
+        except Exception as e:
+            if attempt == UPLOAD_ATTEMPTS - 1:
+                logger.error("Failed to upload blob %s: %s", blob_name, e)
+                raise
+            logger.warning("Upload attempt %d for %s failed, retrying: %s", attempt + 1, blob_name, e)
+            time.sleep(2 ** attempt)
 
 @app.route('/upload', methods=['POST'])
 def upload_test_file():
-    """Upload a test file to demonstrate write access"""
+    """Queue a test file upload to demonstrate write access
+
+    Returns 202 Accepted immediately; poll /upload/status?name=<blob_name>
+    for the result.
+    """
+    # One timestamp for the blob name, content and response
+    now = datetime.now(timezone.utc)
+    timestamp = now.isoformat().replace('+00:00', 'Z')
+
     try:
         # Create a test file content
-        timestamp = datetime.utcnow().isoformat()
-        blob_name = f"test-file-{timestamp}.txt"
+        blob_name = f"{TEST_FILE_PREFIX}{timestamp}.txt"
         content = f"Test file created at {timestamp}\nThis file was uploaded using workload identity!\n"
+        data = content.encode('utf-8')
         
-        # Upload the blob
-        blob_client = blob_service_client.get_blob_client(
-            container=CONTAINER_NAME,
-            blob=blob_name
-        )
-        blob_client.upload_blob(content, overwrite=True)
+        # Upload the blob in the background
+        future = upload_pool.submit(upload_with_retry, blob_name, data)
+        with upload_futures_lock:
+            upload_futures[blob_name] = future
+            while len(upload_futures) > MAX_TRACKED_UPLOADS:
+                upload_futures.popitem(last=False)
         
-        logger.info(f"Successfully uploaded blob: {blob_name}")
-        
-        return jsonify({
-            'status': 'success',
+        return json_response({
+            'status': 'accepted',
             'blob_name': blob_name,
             'container': CONTAINER_NAME,
-            'size': len(content),
-            'message': 'File uploaded successfully using managed identity',
+            'size': len(data),
+            'message': 'File upload queued using managed identity',
+            'status_url': url_for('upload_status', name=blob_name),
             'timestamp': timestamp
-        })
+        }, 202)
     except Exception as e:
-        logger.error(f"Failed to upload blob: {str(e)}")
+        logger.error("Failed to queue blob upload: %s", e)
         # Return a sanitized error message for security
-        return jsonify({
+        return json_response({
             'status': 'error',
             'error': 'Unable to upload file. Check logs for details.',
-            'timestamp': datetime.utcnow().isoformat()
-        }), 500
+            'timestamp': timestamp
+        }, 500)
+
+@app.route('/upload/status')
+def upload_status():
+    """Report the result of a queued upload
+
+    Pending and failed uploads are only known to the worker that accepted
+    them. Other workers and replicas check the container instead, so they
+    can report success but not pending or error.
+    """
+    blob_name = request.args.get('name', '')
+    with upload_futures_lock:
+        future = upload_futures.get(blob_name)
+
+    if future is None:
+        # Accepted by another worker or replica, or no longer tracked here
+        try:
+            found = (
+                blob_name.startswith(TEST_FILE_PREFIX)
+                and container_client.get_blob_client(blob_name).exists()
+            )
+        except Exception as e:
+            logger.error("Failed to check upload status for %s: %s", blob_name, e)
+            # Return a sanitized error message for security
+            return json_response({
+                'status': 'error',
+                'error': 'Unable to check upload status. Check logs for details.',
+                'blob_name': blob_name
+            }, 500)
+
+        if not found:
+            return json_response({
+                'status': 'unknown',
+                'error': 'No upload with that name was found.',
+                'blob_name': blob_name
+            }, 404)
+        status = 'success'
+    elif not future.done():
+        status = 'pending'
+    elif future.exception() is not None:
+        status = 'error'
+    else:
+        status = 'success'
+
+    result = {
+        'status': status,
+        'blob_name': blob_name,
+        'container': CONTAINER_NAME
+    }
+    if status == 'error':
+        # Return a sanitized error message for security
+        result['error'] = 'Unable to upload file. Check logs for details.'
+    return json_response(result)
+
+def cleanup_test_files():
+    """Delete expired test files written by this app using batch requests
+
+    Only TEST_FILE_PREFIX blobs are considered, so test files uploaded to the
+    same container by other labs are left alone. Returns the number of blobs actually deleted.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=TEST_FILE_RETENTION_MINUTES)
+    expired = [
+        blob.name
+        for blob in container_client.list_blobs(name_starts_with=TEST_FILE_PREFIX)
+        if blob.last_modified < cutoff
+    ]
+
+    # Each delete_blobs call sends one multipart batch request; other
+    # workers may have deleted some of these already, so failed
+    # sub-requests are skipped and only successful deletes (202) are counted
+    deleted = 0
+    for start in range(0, len(expired), DELETE_BATCH_SIZE):
+        responses = container_client.delete_blobs(
+            *expired[start:start + DELETE_BATCH_SIZE],
+            raise_on_any_failure=False
+        )
+        deleted += sum(1 for response in responses if response.status_code == 202)
+    return deleted
+
+def run_cleanup():
+    """Run one cleanup pass and schedule the next one"""
+    try:
+        deleted = cleanup_test_files()
+        if deleted:
+            logger.info("Deleted %d expired test files", deleted)
+    except Exception as e:
+        logger.error("Test file cleanup failed: %s", e)
+    finally:
+        schedule_cleanup(CLEANUP_INTERVAL_SECONDS)
+
+def schedule_cleanup(delay):
+    """Schedule the next cleanup pass on a daemon timer thread"""
+    timer = threading.Timer(delay, run_cleanup)
+    timer.daemon = True
+    timer.start()
+
+# Every worker in every replica runs its own sweep. Start each one at a
+# random point in the interval so the sweeps are spread out over time
+if CLEANUP_INTERVAL_SECONDS > 0:
+    schedule_cleanup(random.uniform(0, CLEANUP_INTERVAL_SECONDS))
 
 if __name__ == '__main__':
+    logger.warning(
+        "Running with the Flask development server; use gunicorn in production "
+        "(see Dockerfile)"
+    )
     logger.info("Starting AKS Storage Lab application")
-    logger.info(f"Storage Account: {STORAGE_ACCOUNT_NAME}")
-    logger.info(f"Container: {CONTAINER_NAME}")
+    logger.info("Storage Account: %s", STORAGE_ACCOUNT_NAME)
+    logger.info("Container: %s", CONTAINER_NAME)
     
     # Run the Flask app
     app.run(host='0.0.0.0', port=8080, debug=False)